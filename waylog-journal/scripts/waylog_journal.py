@@ -2,18 +2,25 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import contextlib
 import hashlib
 import json
+import mmap
 import os
 import re
 import shutil
+import string
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 MANAGED_BEGIN = "<!-- waylog-summary:begin -->"
 MANAGED_END = "<!-- waylog-summary:end -->"
@@ -32,10 +39,33 @@ ENTRY_END = "<!-- waylog-entry:end -->"
 
 ENTRY_META_RE = re.compile(r"^<!--\s*waylog-entry:\s*(?P<body>.*?)\s*-->$")
 
+# History filenames look like YYYY-MM-DD_HH-MM-SSZ-...
+FILENAME_STARTED_AT_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})Z")
+HOME_PATH_RE = re.compile(r"/Users/[^/]+/")
+
+JSON_DECODER = json.JSONDecoder()
+
+SANITIZE_CACHE_MAX_CHARS = 4096
+
+# Characters allowed in an MCP server name used as a `-c mcp_servers.<name>...` key.
+MCP_SERVER_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
 FALLBACK_HIGHLIGHT = "Summary generation failed (see stderr)."
 
 DEFAULT_CODEX_HOME_MODE = "inherit"
 
+SHA256_TEXT_CHUNK_CHARS = 64 * 1024
+
+# The line boundaries recognized by `str.splitlines()`.
+LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# sessions.md is rewritten after this many new entries, or once this long has passed since the last write.
+SESSIONS_WRITE_EVERY = 5
+SESSIONS_WRITE_INTERVAL_SEC = 10.0
+
+# Per-file (inode, size, mtime) -> sha256, persisted next to the sessions file.
+SHA_CACHE_FILENAME = ".sha_cache.json"
+
 
 SUMMARY_SCHEMA: dict[str, Any] = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
@@ -77,31 +107,98 @@ JOURNAL_SCHEMA: dict[str, Any] = {
     "required": ["journal_markdown"],
 }
 
+# Serialized once; main() writes these verbatim for `codex exec --output-schema`.
+SUMMARY_SCHEMA_JSON = json.dumps(SUMMARY_SCHEMA, indent=2)
+JOURNAL_SCHEMA_JSON = json.dumps(JOURNAL_SCHEMA, indent=2)
 
-REDACTIONS: list[tuple[re.Pattern[str], str]] = [
-    (
-        re.compile(
-            r"-----BEGIN [A-Z0-9 ]*PRIVATE KEY-----[\s\S]*?-----END [A-Z0-9 ]*PRIVATE KEY-----",
-            re.MULTILINE,
-        ),
-        "[REDACTED_PRIVATE_KEY]",
-    ),
-    (re.compile(r"\bsk-[A-Za-z0-9_-]{20,}\b"), "[REDACTED_API_KEY]"),
-    (re.compile(r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b"), "[REDACTED_AWS_ACCESS_KEY_ID]"),
-    (re.compile(r"\bgh[pousr]_[A-Za-z0-9]{20,}\b"), "[REDACTED_GITHUB_TOKEN]"),
-    (re.compile(r"\bxox[baprs]-[A-Za-z0-9-]{10,}\b"), "[REDACTED_SLACK_TOKEN]"),
-    (
+
+# `{repo_name}` and `{sessions_json}` are filled per run; the rest of the prompt is fixed.
+JOURNAL_PROMPT_TEMPLATE = "\n".join(
+    [
+        "You are maintaining a concise engineering journal for the repository `{repo_name}`.",
+        "",
+        "Input: a list of per-session summaries from `.waylog/history/*.md`.",
+        "Goal: output a usable, low-noise history of the project's evolution (decisions + implementation changes).",
+        "",
+        "Tooling constraint:",
+        "- Do NOT run any shell commands or read any files. Use only the provided JSON input.",
+        "",
+        "Rules:",
+        "- Preserve chronological order.",
+        "- Focus only on items that affected the code/spec/docs/tests of this repository.",
+        "- Drop sessions labeled `relevance_label=unrelated` unless they clearly impacted this repo anyway.",
+        "- Remove noise: greetings, unrelated math, unrelated projects/topics, duplicated bullets, and repetitive security boilerplate.",
+        "- Prefer milestones and deltas (what changed + why) over step-by-step narration.",
+        "- Keep it compact (think: a changelog + decisions log).",
+        "- Do NOT include secrets, credentials, tokens, API keys, passwords, private keys, or PII. If something was redacted, say 'redacted' without details.",
+        "",
+        "Produce markdown with dated sections (`## YYYY-MM-DD`) and bullets under each date.",
+        "Optional: prefix bullets with area tags like `[spec]`, `[db]`, `[cli]`, `[web]`, `[docs]`, `[tests]`.",
+        "",
+        "Per-session summaries (JSON, sanitized):",
+        "{sessions_json}",
+        "",
+    ]
+)
+
+
+# PEM private keys are located with literal `str.find` scans (see `iter_private_key_spans`)
+# rather than a lazy `[\s\S]*?` regex that advances one character at a time.
+PRIVATE_KEY_BEGIN = "-----BEGIN "
+PRIVATE_KEY_END = "-----END "
+PRIVATE_KEY_LABEL_RE = re.compile(r"[A-Z0-9 ]*")
+PRIVATE_KEY_LABEL_SUFFIX = "PRIVATE KEY"
+PRIVATE_KEY_REPLACEMENT = "[REDACTED_PRIVATE_KEY]"
+
+# Keyed by the category name reported by `detect_sensitive_categories`; order is the
+# order substitutions are applied in `sanitize_text`.
+REDACTIONS_BY_NAME: dict[str, tuple[re.Pattern[str], str]] = {
+    "api_key": (re.compile(r"\bsk-[A-Za-z0-9_-]{20,}\b"), "[REDACTED_API_KEY]"),
+    "aws_access_key_id": (re.compile(r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b"), "[REDACTED_AWS_ACCESS_KEY_ID]"),
+    "github_token": (re.compile(r"\bgh[pousr]_[A-Za-z0-9]{20,}\b"), "[REDACTED_GITHUB_TOKEN]"),
+    "slack_token": (re.compile(r"\bxox[baprs]-[A-Za-z0-9-]{10,}\b"), "[REDACTED_SLACK_TOKEN]"),
+    "jwt": (
         re.compile(r"\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\b"),
         "[REDACTED_JWT]",
     ),
-    (
+    "credential_kv": (
         re.compile(
-            r"(?i)\b(api[_-]?key|token|secret|password|passwd|passphrase)\b\s*[:=]\s*([^\s,;]+)"
+            r"\b(api[_-]?key|token|secret|password|passwd|passphrase)\b\s*[:=]\s*([^\s,;]+)",
+            re.IGNORECASE,
         ),
         r"\1=[REDACTED]",
     ),
-    (re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"), "[REDACTED_EMAIL]"),
-]
+    "email": (re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"), "[REDACTED_EMAIL]"),
+}
+
+# Substrings at least one of which every match of the named pattern contains. A plain `in`
+# test rejects a transcript far faster than a `\b`-anchored regex scan; names without an
+# entry (the case-insensitive credential pattern) always run their regex.
+REDACTION_LITERALS: dict[str, tuple[str, ...]] = {
+    "api_key": ("sk-",),
+    "aws_access_key_id": ("AKIA", "ASIA"),
+    "github_token": ("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+    "slack_token": ("xox",),
+    "jwt": ("eyJ",),
+    "email": ("@",),
+}
+
+
+def may_contain_redaction(name: str, text: str) -> bool:
+    literals = REDACTION_LITERALS.get(name)
+    return literals is None or any(literal in text for literal in literals)
+
+
+def build_redaction_re(redactions: list[tuple[re.Pattern[str], str]]) -> re.Pattern[str]:
+    alternatives: list[str] = []
+    for pattern, _ in redactions:
+        flags = "i" if pattern.flags & re.IGNORECASE else ""
+        alternatives.append(f"(?{flags}:{pattern.pattern})")
+    return re.compile("|".join(alternatives))
+
+
+# Matches wherever any single REDACTIONS_BY_NAME pattern would match, in one scan of the text.
+REDACTION_RE = build_redaction_re(list(REDACTIONS_BY_NAME.values()))
 
 
 @dataclass(frozen=True)
@@ -114,6 +211,8 @@ class HistorySession:
     message_count: str
     title: str
     content: str
+    sha256: str
+    sensitive_categories: tuple[str, ...]
 
 
 @dataclass(frozen=True)
@@ -125,23 +224,28 @@ class ExistingEntry:
     block: str
 
 
+@dataclass(frozen=True)
+class UpdateTask:
+    # A history file the planning pass found new, changed, failed or forced.
+    path: Path
+    rel_path: str
+
+
 def eprint(*args: object) -> None:
     print(*args, file=sys.stderr)
 
 
 def format_waylog_install_help() -> str:
-    return "\n".join(
-        [
-            "WayLog CLI (`waylog`) was not found on your PATH.",
-            "",
-            "Install it (macOS/Homebrew):",
-            "  brew install shayne-snap/tap/waylog",
-            "",
-            "Install it (Rust/Cargo):",
-            "  cargo install waylog",
-            "",
-            f"More info: {WAYLOG_REPO_URL}",
-        ]
+    return (
+        "WayLog CLI (`waylog`) was not found on your PATH.\n"
+        "\n"
+        "Install it (macOS/Homebrew):\n"
+        "  brew install shayne-snap/tap/waylog\n"
+        "\n"
+        "Install it (Rust/Cargo):\n"
+        "  cargo install waylog\n"
+        "\n"
+        f"More info: {WAYLOG_REPO_URL}"
     )
 
 
@@ -160,23 +264,37 @@ def find_git_root(start: Path) -> Path | None:
 
 
 def parse_front_matter(text: str) -> tuple[dict[str, str], str]:
-    lines = text.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}, text
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            fm_lines = lines[1:i]
-            rest = "\n".join(lines[i + 1 :])
-            fm: dict[str, str] = {}
-            for line in fm_lines:
-                if not line.strip() or line.strip().startswith("#") or ":" not in line:
-                    continue
-                key, value = line.split(":", 1)
-                fm[key.strip()] = value.strip()
-            return fm, rest
+    # Walk line breaks only until the closing `---` instead of splitting the head and body
+    # together; LINE_BREAK_RE matches the boundaries `str.splitlines()` uses for the body.
+    fm_lines: list[str] | None = None
+    pos = 0
+    for m in LINE_BREAK_RE.finditer(text):
+        line = text[pos : m.start()]
+        pos = m.end()
+        if fm_lines is None:
+            if line.strip() != "---":
+                return {}, text
+            fm_lines = []
+        elif line.strip() == "---":
+            return parse_front_matter_lines(fm_lines), "\n".join(text[pos:].splitlines())
+        else:
+            fm_lines.append(line)
+    # The last line has no trailing line break.
+    if fm_lines is not None and pos < len(text) and text[pos:].strip() == "---":
+        return parse_front_matter_lines(fm_lines), ""
     return {}, text
 
 
+def parse_front_matter_lines(lines: list[str]) -> dict[str, str]:
+    fm: dict[str, str] = {}
+    for line in lines:
+        if not line.strip() or line.strip().startswith("#") or ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        fm[key.strip()] = value.strip()
+    return fm
+
+
 def extract_title(body: str) -> str:
     for line in body.splitlines():
         if line.startswith("# "):
@@ -185,8 +303,7 @@ def extract_title(body: str) -> str:
 
 
 def parse_started_at_from_filename(name: str) -> str:
-    # Expected: YYYY-MM-DD_HH-MM-SSZ-...
-    m = re.match(r"^(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})Z", name)
+    m = FILENAME_STARTED_AT_RE.match(name)
     if not m:
         return ""
     date, hh, mm, ss = m.groups()
@@ -194,55 +311,187 @@ def parse_started_at_from_filename(name: str) -> str:
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Map the file and hash it in one update() instead of a Python-level read loop.
+        h = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                h.update(mapped)
+        return h.hexdigest()
+
+
+def load_sha_cache(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def cached_sha256(
+    path: Path,
+    rel_path: str,
+    cache: dict[str, dict[str, Any]],
+    st: os.stat_result | None = None,
+) -> str:
+    # A history file whose inode, size and mtime are unchanged since the last run is not re-read.
+    if st is None:
+        st = path.stat()
+    entry = cache.get(rel_path)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+        and entry.get("ino") == st.st_ino
+        and isinstance(entry.get("sha256"), str)
+    ):
+        return entry["sha256"]
+    digest = sha256_file(path)
+    cache[rel_path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "ino": st.st_ino, "sha256": digest}
+    return digest
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
 
 
 def sha256_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+    # Encode in slices so large transcripts never need a full-size bytes copy.
+    h = hashlib.sha256()
+    encoder = codecs.getincrementalencoder("utf-8")(errors="replace")
+    for start in range(0, len(text), SHA256_TEXT_CHUNK_CHARS):
+        h.update(encoder.encode(text[start : start + SHA256_TEXT_CHUNK_CHARS]))
+    h.update(encoder.encode("", final=True))
+    return h.hexdigest()
+
+
+def private_key_label_end(text: str, start: int) -> int:
+    # Matches `[A-Z0-9 ]*PRIVATE KEY-----` at `start`; returns the end offset or -1.
+    label_end = PRIVATE_KEY_LABEL_RE.match(text, start).end()
+    if not text.endswith(PRIVATE_KEY_LABEL_SUFFIX, start, label_end):
+        return -1
+    if not text.startswith("-----", label_end):
+        return -1
+    return label_end + 5
+
+
+def iter_private_key_spans(text: str) -> Iterator[tuple[int, int]]:
+    search_from = 0
+    while True:
+        begin = text.find(PRIVATE_KEY_BEGIN, search_from)
+        if begin == -1:
+            return
+        header_end = private_key_label_end(text, begin + len(PRIVATE_KEY_BEGIN))
+        if header_end == -1:
+            search_from = begin + 1
+            continue
+        end = -1
+        footer = text.find(PRIVATE_KEY_END, header_end)
+        while footer != -1:
+            end = private_key_label_end(text, footer + len(PRIVATE_KEY_END))
+            if end != -1:
+                break
+            footer = text.find(PRIVATE_KEY_END, footer + 1)
+        if end == -1:
+            # Any later header ends after this one, so it cannot find a footer either.
+            return
+        yield begin, end
+        search_from = end
+
+
+def redact_private_keys(text: str) -> str:
+    parts: list[str] = []
+    pos = 0
+    for start, end in iter_private_key_spans(text):
+        parts.append(text[pos:start])
+        parts.append(PRIVATE_KEY_REPLACEMENT)
+        pos = end
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
 
 
 def sanitize_text(text: str) -> str:
+    # Titles, bullets and areas repeat across entries and runs of the journal pass; memoize
+    # those short strings and keep whole transcripts out of the cache.
+    if len(text) <= SANITIZE_CACHE_MAX_CHARS:
+        return sanitize_short_text(text)
+    return sanitize_text_uncached(text)
+
+
+@lru_cache(maxsize=8192)
+def sanitize_short_text(text: str) -> str:
+    return sanitize_text_uncached(text)
+
+
+def sanitize_text_uncached(text: str) -> str:
     sanitized = text
-    sanitized = re.sub(r"/Users/[^/]+/", "/Users/<user>/", sanitized)
-    for pattern, repl in REDACTIONS:
-        sanitized = pattern.sub(repl, sanitized)
+    sanitized = HOME_PATH_RE.sub("/Users/<user>/", sanitized)
+    sanitized = redact_private_keys(sanitized)
+    # Most strings contain nothing to redact; one fused scan proves that. Substituting
+    # through the fused pattern directly is not equivalent: an earlier-starting match
+    # (e.g. an email) can swallow the head of a later secret (e.g. a JWT) and leak the rest.
+    if REDACTION_RE.search(sanitized) is None:
+        return sanitized
+    for name, (pattern, repl) in REDACTIONS_BY_NAME.items():
+        if may_contain_redaction(name, sanitized):
+            sanitized = pattern.sub(repl, sanitized)
     return sanitized
 
 
 def detect_sensitive_categories(text: str) -> list[str]:
     categories: list[str] = []
-    checks: list[tuple[str, re.Pattern[str]]] = [
-        ("private_key", REDACTIONS[0][0]),
-        ("api_key", REDACTIONS[1][0]),
-        ("aws_access_key_id", REDACTIONS[2][0]),
-        ("github_token", REDACTIONS[3][0]),
-        ("slack_token", REDACTIONS[4][0]),
-        ("jwt", REDACTIONS[5][0]),
-        ("credential_kv", REDACTIONS[6][0]),
-        ("email", REDACTIONS[7][0]),
-    ]
-    for name, pattern in checks:
-        if pattern.search(text):
+    if next(iter_private_key_spans(text), None) is not None:
+        categories.append("private_key")
+    # No pattern can match before the first hit of the fused scan, so start every search there.
+    first = REDACTION_RE.search(text)
+    if first is None:
+        return categories
+    start = first.start()
+    for name, (pattern, _) in REDACTIONS_BY_NAME.items():
+        if may_contain_redaction(name, text) and pattern.search(text, start):
             categories.append(name)
     return categories
 
 
+def list_history_md(history_dir: Path) -> list[os.DirEntry[str]]:
+    # Same entries as `history_dir.glob("*.md")` sorted by name, from one directory scan; each
+    # DirEntry caches its stat() for the hash-cache lookup.
+    with os.scandir(history_dir) as it:
+        entries = [entry for entry in it if entry.name.endswith(".md")]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def history_rel_path(repo_root: Path, path: Path) -> str:
+    return str(path.relative_to(repo_root).as_posix())
+
+
+def decode_text(data: bytes) -> str:
+    # Same result as `Path.read_text(encoding="utf-8", errors="replace")`, including its
+    # universal-newline translation, for callers that also need the raw bytes.
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def parse_history_session(repo_root: Path, path: Path, max_chars: int | None) -> HistorySession:
-    raw = path.read_text(encoding="utf-8", errors="replace")
+    # One read serves the hash, the parsed fields and sensitive-data detection.
+    data = path.read_bytes()
+    raw = decode_text(data)
     fm, body = parse_front_matter(raw)
 
     title = extract_title(body)
 
     content = raw
-    if max_chars is not None and max_chars > 0 and len(content) > max_chars:
-        content = content[-max_chars:]
-        content = f"[...truncated to last {max_chars} chars...]\n\n{content}"
+    if max_chars is not None and max_chars > 0 and len(raw) > max_chars:
+        content = f"[...truncated to last {max_chars} chars...]\n\n{raw[-max_chars:]}"
 
-    rel_path = str(path.relative_to(repo_root).as_posix())
+    rel_path = history_rel_path(repo_root, path)
     started_at = fm.get("started_at") or parse_started_at_from_filename(path.name) or ""
 
     return HistorySession(
@@ -254,15 +503,20 @@ def parse_history_session(repo_root: Path, path: Path, max_chars: int | None) ->
         message_count=fm.get("message_count", ""),
         title=title,
         content=content,
+        sha256=sha256_bytes(data),
+        sensitive_categories=tuple(detect_sensitive_categories(raw)),
     )
 
 
 def extract_between(text: str, begin: str, end: str) -> tuple[str, str, str] | None:
-    if begin not in text or end not in text:
+    b = text.find(begin)
+    if b < 0:
+        return None
+    mid = b + len(begin)
+    e = text.find(end, mid)
+    if e < 0:
         return None
-    before, rest = text.split(begin, 1)
-    middle, after = rest.split(end, 1)
-    return before, middle, after
+    return text[:b], text[mid:e], text[e + len(end) :]
 
 
 def extract_between_optional(text: str, begin: str, end: str) -> tuple[str, str, str]:
@@ -309,40 +563,47 @@ def parse_entry_meta(line: str) -> dict[str, str] | None:
 
 
 def parse_existing_entries(managed_body: str) -> dict[str, ExistingEntry]:
+    # Walk line boundaries with `str.find` and slice blocks out of the original text,
+    # instead of materializing `splitlines()` and re-joining each block.
     entries: dict[str, ExistingEntry] = {}
-    lines = managed_body.splitlines()
-    i = 0
-    while i < len(lines):
-        if lines[i].startswith("## "):
-            header_line = lines[i]
-            if i + 1 < len(lines):
-                meta = parse_entry_meta(lines[i + 1])
-                if meta:
-                    rel_path = meta.get("file", "")
-                    sha = meta.get("sha256", "")
-                    updated_at = meta.get("updated_at", "")
-                    block_lines = [header_line, lines[i + 1]]
-                    i += 2
-                    while i < len(lines):
-                        block_lines.append(lines[i])
-                        if lines[i].strip() == ENTRY_END:
-                            i += 1
-                            break
-                        i += 1
-                    block = "\n".join(block_lines)
-                    status = meta.get("status", "")
-                    if not status:
-                        # Backwards-compat: treat older fallback entries as retriable.
-                        status = "error" if FALLBACK_HIGHLIGHT in block else "ok"
-                    entries[rel_path] = ExistingEntry(
-                        rel_path=rel_path,
-                        sha256=sha,
-                        updated_at=updated_at,
-                        status=status,
-                        block=block,
-                    )
-                    continue
-        i += 1
+    n = len(managed_body)
+    pos = 0
+    while pos < n:
+        nl = managed_body.find("\n", pos)
+        line_end = n if nl == -1 else nl
+        next_pos = line_end + 1
+        if managed_body.startswith("## ", pos) and next_pos < n:
+            meta_nl = managed_body.find("\n", next_pos)
+            meta_end = n if meta_nl == -1 else meta_nl
+            meta = parse_entry_meta(managed_body[next_pos:meta_end])
+            if meta:
+                rel_path = meta.get("file", "")
+                sha = meta.get("sha256", "")
+                updated_at = meta.get("updated_at", "")
+                block_end = meta_end
+                cursor = meta_end + 1
+                while cursor < n:
+                    nl = managed_body.find("\n", cursor)
+                    block_end = n if nl == -1 else nl
+                    is_end = managed_body[cursor:block_end].strip() == ENTRY_END
+                    cursor = block_end + 1
+                    if is_end:
+                        break
+                block = managed_body[pos:block_end]
+                status = meta.get("status", "")
+                if not status:
+                    # Backwards-compat: treat older fallback entries as retriable.
+                    status = "error" if FALLBACK_HIGHLIGHT in block else "ok"
+                entries[rel_path] = ExistingEntry(
+                    rel_path=rel_path,
+                    sha256=sha,
+                    updated_at=updated_at,
+                    status=status,
+                    block=block,
+                )
+                pos = cursor
+                continue
+        pos = next_pos
     return entries
 
 
@@ -351,10 +612,11 @@ def json_load_loose(text: str) -> dict[str, Any]:
         return json.loads(text)
     except json.JSONDecodeError:
         start = text.find("{")
-        end = text.rfind("}")
-        if start == -1 or end == -1 or end <= start:
+        if start == -1:
             raise
-        return json.loads(text[start : end + 1])
+        # Decode from the first brace and ignore whatever prose follows the object.
+        obj, _ = JSON_DECODER.raw_decode(text, start)
+        return obj
 
 
 def list_codex_mcp_servers(
@@ -398,6 +660,77 @@ def list_codex_mcp_servers(
     return servers
 
 
+def codex_mcp_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home).expanduser() / "waylog-journal" / "mcp-servers.json"
+
+
+def codex_mcp_cache_key(
+    codex_bin: str,
+    *,
+    codex_base_args: list[str],
+    env: dict[str, str] | None,
+    cwd: Path | None,
+) -> dict[str, Any] | None:
+    # The server list depends on the codex binary and on the config it reads, so the key
+    # covers both; config files are hashed because seeded temp homes get fresh copies.
+    resolved = shutil.which(codex_bin, path=(env or os.environ).get("PATH"))
+    if resolved is None:
+        return None
+    st = os.stat(resolved)
+    codex_home = Path((env or os.environ).get("CODEX_HOME") or Path.home() / ".codex").expanduser()
+    config_files = [codex_home / "config.toml"]
+    if cwd is not None:
+        config_files.append(cwd / ".codex" / "config.toml")
+    config_sha256: list[str] = []
+    for config_file in config_files:
+        try:
+            config_sha256.append(sha256_bytes(config_file.read_bytes()))
+        except OSError:
+            config_sha256.append("")
+    return {
+        "codex_bin": os.path.realpath(resolved),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "base_args": codex_base_args,
+        "config_sha256": config_sha256,
+    }
+
+
+def list_codex_mcp_servers_cached(
+    codex_bin: str,
+    *,
+    codex_base_args: list[str],
+    env: dict[str, str] | None,
+    cwd: Path | None,
+) -> list[dict[str, Any]]:
+    # `codex mcp list` costs a process start per run; reuse the last listing while the
+    # binary and its config are unchanged. Empty listings (which include failures) are not cached.
+    try:
+        key = codex_mcp_cache_key(codex_bin, codex_base_args=codex_base_args, env=env, cwd=cwd)
+    except OSError:
+        key = None
+    cache_path = codex_mcp_cache_path()
+    if key is not None:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+        if isinstance(cached, dict) and cached.get("key") == key and isinstance(cached.get("servers"), list):
+            return [item for item in cached["servers"] if isinstance(item, dict)]
+
+    servers = list_codex_mcp_servers(codex_bin, codex_base_args=codex_base_args, env=env, cwd=cwd)
+    if key is not None and servers:
+        # Only what build_codex_mcp_disable_overrides reads; server entries also carry transport
+        # config (env vars, headers) that must not be copied to another file on disk.
+        cached_servers = [{"name": server.get("name"), "enabled": server.get("enabled")} for server in servers]
+        try:
+            write_atomic(cache_path, json.dumps({"key": key, "servers": cached_servers}, indent=2))
+        except OSError as exc:
+            eprint(f"[warn] Failed to write MCP server cache {cache_path}: {exc}")
+    return servers
+
+
 def build_codex_mcp_disable_overrides(
     servers: list[dict[str, Any]],
     *,
@@ -410,7 +743,7 @@ def build_codex_mcp_disable_overrides(
             continue
         if only_enabled and not bool(server.get("enabled")):
             continue
-        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+        if not MCP_SERVER_NAME_CHARS.issuperset(name):
             eprint(f"[warn] Skipping MCP server with unsupported name: {name!r}")
             continue
         overrides.append(f"mcp_servers.{name}.enabled=false")
@@ -685,8 +1018,12 @@ def run_codex_journal(
     return journal, usage
 
 
-def make_prompt(repo_root: Path, session: HistorySession, sensitive_categories: list[str]) -> str:
-    cat_note = ", ".join(sensitive_categories) if sensitive_categories else "none detected"
+def make_prompt(
+    repo_name: str,
+    sanitized_repo_root: str,
+    session: HistorySession,
+) -> str:
+    cat_note = ", ".join(session.sensitive_categories) if session.sensitive_categories else "none detected"
     return "\n".join(
         [
             "You are summarizing an AI chat transcript from `.waylog/history/*.md`.",
@@ -694,8 +1031,8 @@ def make_prompt(repo_root: Path, session: HistorySession, sensitive_categories:
             "Goal: produce a concise journal entry of important decisions and implementation details.",
             "",
             "This summary is specifically for the current repository:",
-            f"- repo_name: {repo_root.name}",
-            f"- repo_root: {sanitize_text(str(repo_root))}",
+            f"- repo_name: {repo_name}",
+            f"- repo_root: {sanitized_repo_root}",
             "",
             "Tooling constraint:",
             "- Do NOT run any shell commands or read any files. The full transcript is provided below.",
@@ -821,59 +1158,73 @@ def render_entry(
 
 
 def build_default_sessions_file() -> str:
-    return "\n".join(
-        [
-            "# Waylog Sessions",
-            "",
-            "Internal, auto-generated per-session summaries (sanitized).",
-            "",
-            f"{MANAGED_BEGIN}",
-            f"{MANAGED_END}",
-            "",
-        ]
+    return (
+        "# Waylog Sessions\n"
+        "\n"
+        "Internal, auto-generated per-session summaries (sanitized).\n"
+        "\n"
+        f"{MANAGED_BEGIN}\n"
+        f"{MANAGED_END}\n"
     )
 
 
 def build_default_journal_file(manual_body: str = "") -> str:
-    lines: list[str] = [
-        "# Waylog Summary",
-        "",
-        "Condensed journal of project decisions and implementation evolution (sanitized).",
-        "",
-        f"{JOURNAL_BEGIN}",
-        f"{JOURNAL_END}",
-        "",
-        "## Manual Notes",
-        f"{MANUAL_BEGIN}",
-    ]
-    if manual_body:
-        lines.append(manual_body)
-    lines.extend([f"{MANUAL_END}", ""])
-    return "\n".join(lines)
+    manual = f"{manual_body}\n" if manual_body else ""
+    return (
+        "# Waylog Summary\n"
+        "\n"
+        "Condensed journal of project decisions and implementation evolution (sanitized).\n"
+        "\n"
+        f"{JOURNAL_BEGIN}\n"
+        f"{JOURNAL_END}\n"
+        "\n"
+        "## Manual Notes\n"
+        f"{MANUAL_BEGIN}\n"
+        f"{manual}"
+        f"{MANUAL_END}\n"
+    )
 
 
 def write_atomic(path: Path, content: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.NamedTemporaryFile(
-        mode="w", encoding="utf-8", delete=False, dir=str(path.parent)
-    ) as tmp:
-        tmp_path = Path(tmp.name)
-        tmp.write(content)
-        tmp.write("" if content.endswith("\n") else "\n")
-    tmp_path.replace(path)
+    data = content.encode("utf-8")
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    # Encode once and write the raw fd; fsync so the rename never exposes a short file. The
+    # temp file sits next to the target so os.replace is a same-filesystem rename, and the
+    # prefix/suffix keep a leftover from a crash hidden and recognizable.
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=".waylog-", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+            if hasattr(os, "posix_fadvise"):
+                # The pages are clean after fsync and nothing re-reads them this run; advise the
+                # kernel to drop them rather than keep a MiB-scale file hot in the page cache.
+                with contextlib.suppress(OSError):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def render_sessions_body(history_order: list[str], blocks: dict[str, str]) -> str:
+    # One dict lookup per history file (`get`) instead of `in` followed by `[]`.
+    return "\n\n".join(
+        [block for rel_path in history_order if (block := blocks.get(rel_path)) is not None]
+    ).strip()
 
 
 def render_summary(before: str, after: str, history_order: list[str], blocks: dict[str, str]) -> str:
-    body_blocks = [blocks[rel_path] for rel_path in history_order if rel_path in blocks]
-    new_managed_body = "\n\n".join(body_blocks).strip()
-    return (
-        before
-        + MANAGED_BEGIN
-        + "\n"
-        + (new_managed_body + "\n" if new_managed_body else "")
-        + MANAGED_END
-        + after
-    )
+    new_managed_body = render_sessions_body(history_order, blocks)
+    managed = f"{new_managed_body}\n" if new_managed_body else ""
+    return f"{before}{MANAGED_BEGIN}\n{managed}{MANAGED_END}{after}"
 
 
 def render_journal_file(journal_body: str, *, sessions_sha: str, previous_text: str | None) -> str:
@@ -935,24 +1286,28 @@ def parse_session_block_for_journal(block: str) -> dict[str, Any] | None:
     for line in lines[2:]:
         if line.strip() == ENTRY_END:
             break
-        if line.startswith("- Relevance:"):
-            value = line.removeprefix("- Relevance:").strip()
-            if value:
-                relevance_label = value.split("(", 1)[0].strip()
-            continue
-        if line.startswith("- Relevance Reason:"):
-            relevance_reason = line.removeprefix("- Relevance Reason:").strip()
-            continue
-        if line.startswith("- Areas:"):
-            value = line.removeprefix("- Areas:").strip()
-            if value:
-                relevance_areas = [v.strip() for v in value.split(",") if v.strip()]
-            continue
-        if line.startswith("**") and line.endswith("**"):
+        # Dispatch on the first four characters; plain bullets and prose skip the prefix tests.
+        head = line[:4]
+        if head == "- Re":
+            if line.startswith("- Relevance:"):
+                value = line.removeprefix("- Relevance:").strip()
+                if value:
+                    relevance_label = value.split("(", 1)[0].strip()
+                continue
+            if line.startswith("- Relevance Reason:"):
+                relevance_reason = line.removeprefix("- Relevance Reason:").strip()
+                continue
+        elif head == "- Ar":
+            if line.startswith("- Areas:"):
+                value = line.removeprefix("- Areas:").strip()
+                if value:
+                    relevance_areas = [v.strip() for v in value.split(",") if v.strip()]
+                continue
+        elif head[:2] == "**" and line.endswith("**"):
             key = line.strip("*")
             section = section_map.get(key)
             continue
-        if section and line.startswith("- "):
+        if section and head[:2] == "- ":
             collected[section].append(line[2:].strip())
 
     # Keep prompts bounded; the journal step should dedupe/condense.
@@ -1066,6 +1421,13 @@ def main(argv: list[str]) -> int:
         default=1.0,
         help="Retry backoff base seconds (default: 1.0)",
     )
+    parser.add_argument(
+        "--codex-concurrency",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Max concurrent `codex exec` runs for per-session summaries (default: 4)",
+    )
     parser.add_argument(
         "--model",
         default=os.environ.get("CODEX_MODEL"),
@@ -1122,8 +1484,9 @@ def main(argv: list[str]) -> int:
     sessions_file = Path(args.sessions_file) if args.sessions_file else default_sessions_file
     journal_file = Path(args.journal_file) if args.journal_file else default_journal_file
 
+    waylog_available = shutil.which("waylog") is not None
     if not history_dir.is_dir():
-        if shutil.which("waylog") is None:
+        if not waylog_available:
             eprint(format_waylog_install_help())
             eprint("")
             eprint("Then run `waylog pull` in your repo to populate `.waylog/history/`.")
@@ -1132,7 +1495,9 @@ def main(argv: list[str]) -> int:
             eprint("Try running `waylog pull` in your repo to populate `.waylog/history/`.")
         return 2
 
-    if shutil.which("waylog") is None and not any(history_dir.glob("*.md")):
+    history_entries = list_history_md(history_dir)
+    history_files = [Path(entry.path) for entry in history_entries]
+    if not waylog_available and not history_files:
         eprint(format_waylog_install_help())
         eprint("")
         eprint("This project has an empty `.waylog/history/` directory; run `waylog pull` to recover history.")
@@ -1151,32 +1516,47 @@ def main(argv: list[str]) -> int:
     before, managed_body, after = extract_between(sessions_text, MANAGED_BEGIN, MANAGED_END) or ("", "", "")
     existing_entries = parse_existing_entries(managed_body)
 
-    history_files = sorted(history_dir.glob("*.md"), key=lambda p: p.name)
-
-    updates: list[str] = []
+    # Single planning pass: the dry-run report, the cache pruning and the update loop all reuse it.
+    history_order: list[str] = []
+    updates: list[UpdateTask] = []
     kept: int = 0
 
-    for path in history_files:
-        session = parse_history_session(repo_root, path, args.max_chars)
-        sha = sha256_file(path)
-        existing = existing_entries.get(session.rel_path)
+    sha_cache_file = sessions_file.parent / SHA_CACHE_FILENAME
+    sha_cache = load_sha_cache(sha_cache_file)
+    previous_sha_cache = dict(sha_cache)
+
+    def hash_history_file(entry: os.DirEntry[str]) -> tuple[str, str]:
+        path = Path(entry.path)
+        rel_path = history_rel_path(repo_root, path)
+        return rel_path, cached_sha256(path, rel_path, sha_cache, entry.stat())
+
+    # File reads and hashlib release the GIL, so cache misses are hashed on a thread pool;
+    # map() keeps the results in history order.
+    with ThreadPoolExecutor() as pool:
+        hashed = list(pool.map(hash_history_file, history_entries))
+
+    for path, (rel_path, sha) in zip(history_files, hashed):
+        history_order.append(rel_path)
+        existing = existing_entries.get(rel_path)
         if existing and existing.sha256 == sha and existing.status == "ok" and not args.force:
             kept += 1
         else:
-            updates.append(session.rel_path)
+            updates.append(UpdateTask(path=path, rel_path=rel_path))
 
     if args.dry_run:
         eprint(f"Would update {len(updates)} entries; keep {kept} unchanged.")
-        for p in updates:
-            eprint(f"- {p}")
+        for task in updates:
+            eprint(f"- {task.rel_path}")
         if not args.no_journal:
-            # Best-effort signal for journal regeneration.
-            sessions_sha = sha256_text(managed_body.strip())
-            existing_journal_text = (
-                journal_file.read_text(encoding="utf-8", errors="replace") if journal_file.exists() else ""
-            )
-            journal_sha = extract_journal_sessions_sha(existing_journal_text)
-            if args.force_journal or sessions_sha != (journal_sha or ""):
+            # Best-effort signal for journal regeneration; --force-journal needs no comparison.
+            needs_journal = args.force_journal
+            if not needs_journal:
+                sessions_sha = sha256_text(managed_body.strip())
+                existing_journal_text = (
+                    journal_file.read_text(encoding="utf-8", errors="replace") if journal_file.exists() else ""
+                )
+                needs_journal = sessions_sha != (extract_journal_sessions_sha(existing_journal_text) or "")
+            if needs_journal:
                 eprint("Would regenerate journal.")
             else:
                 eprint("Journal up-to-date.")
@@ -1184,6 +1564,12 @@ def main(argv: list[str]) -> int:
 
     eprint(f"History files: {len(history_files)}. To update: {len(updates)}. Unchanged: {kept}.")
 
+    # Drop entries for history files that no longer exist, and only rewrite the cache when it changed.
+    history_rel_paths = set(history_order)
+    sha_cache = {rel: entry for rel, entry in sha_cache.items() if rel in history_rel_paths}
+    if sha_cache != previous_sha_cache:
+        write_atomic(sha_cache_file, json.dumps(sha_cache, indent=2, sort_keys=True))
+
     model = args.model
     reasoning_effort = args.reasoning_effort
     if updates and not args.no_prompt and sys.stdin.isatty():
@@ -1266,10 +1652,11 @@ def main(argv: list[str]) -> int:
 
         codex_config: list[str] = []
         if args.codex_mcp == "disable-all":
-            servers = list_codex_mcp_servers(
+            servers = list_codex_mcp_servers_cached(
                 args.codex_bin, codex_base_args=codex_base_args, env=codex_env, cwd=codex_cd
             )
             if not servers:
+                # Uncached: the fallback env has its own key and would evict the primary listing.
                 servers = list_codex_mcp_servers(
                     args.codex_bin,
                     codex_base_args=codex_base_args,
@@ -1293,120 +1680,170 @@ def main(argv: list[str]) -> int:
         had_failures = False
 
         summary_schema_path = Path(td) / "waylog_summary_schema.json"
-        summary_schema_path.write_text(json.dumps(SUMMARY_SCHEMA, indent=2), encoding="utf-8")
+        summary_schema_path.write_text(SUMMARY_SCHEMA_JSON, encoding="utf-8")
 
         journal_schema_path = Path(td) / "waylog_journal_schema.json"
-        journal_schema_path.write_text(json.dumps(JOURNAL_SCHEMA, indent=2), encoding="utf-8")
+        journal_schema_path.write_text(JOURNAL_SCHEMA_JSON, encoding="utf-8")
 
-        history_order: list[str] = [
-            str(path.relative_to(repo_root).as_posix()) for path in history_files
-        ]
         blocks: dict[str, str] = {rel: entry.block for rel, entry in existing_entries.items()}
 
-        completed: int = 0
-        try:
-            for path in history_files:
-                session = parse_history_session(repo_root, path, args.max_chars)
-                sha = sha256_file(path)
-                existing = existing_entries.get(session.rel_path)
-                if existing and existing.sha256 == sha and existing.status == "ok" and not args.force:
-                    continue
-
-                completed += 1
-                eprint(f"[{completed}/{len(updates)}] Summarizing {session.rel_path}")
-                sensitive_categories = detect_sensitive_categories(
-                    path.read_text(encoding="utf-8", errors="replace")
+        # Workers parse their own transcript, so only in-flight sessions are held in memory.
+        # The main thread pops each one when it renders the result.
+        parsed_sessions: dict[str, HistorySession] = {}
+
+        # Invariant across sessions; sanitize once instead of once per prompt.
+        repo_name = repo_root.name
+        sanitized_repo_root = sanitize_text(str(repo_root))
+
+        # Set by the worker that hits a network failure, so queued summaries that a free worker
+        # picks up before the main thread has cancelled them do not start another codex run.
+        network_failed = threading.Event()
+
+        def summarize(index: int, task: UpdateTask) -> tuple[dict[str, Any], dict[str, int] | None]:
+            if network_failed.is_set():
+                raise CancelledError()
+            eprint(f"[{index}/{len(updates)}] Summarizing {task.rel_path}")
+            session = parse_history_session(repo_root, task.path, args.max_chars)
+            parsed_sessions[task.rel_path] = session
+            prompt = make_prompt(repo_name, sanitized_repo_root, session)
+            try:
+                return run_codex_summary(
+                    repo_root=repo_root,
+                    codex_bin=args.codex_bin,
+                    codex_base_args=codex_base_args,
+                    model=model,
+                    reasoning_effort=reasoning_effort,
+                    history_persistence=args.codex_history_persistence,
+                    codex_cd=codex_cd,
+                    codex_config=codex_config,
+                    codex_env=codex_env,
+                    codex_fallback_env=codex_fallback_env,
+                    retries=codex_retries,
+                    retry_backoff_sec=codex_retry_backoff_sec,
+                    schema_path=summary_schema_path,
+                    prompt=prompt,
                 )
-                prompt = make_prompt(repo_root, session, sensitive_categories)
-
-                status = "ok"
-                try:
-                    codex_calls_total += 1
-                    data, usage = run_codex_summary(
-                        repo_root=repo_root,
-                        codex_bin=args.codex_bin,
-                        codex_base_args=codex_base_args,
+            except Exception as exc:
+                if is_retryable_codex_error(str(exc)):
+                    network_failed.set()
+                raise
+
+        # Each summary is an independent `codex exec` child, so run several at once. Results are
+        # handled on this thread as they complete; `history_order` keeps the file order stable.
+        executor = ThreadPoolExecutor(max_workers=max(1, int(args.codex_concurrency)))
+        unsaved = 0
+        last_write = time.monotonic()
+        try:
+            futures = {
+                executor.submit(summarize, index, task): task
+                for index, task in enumerate(updates, start=1)
+            }
+            not_done = set(futures)
+            # After a network abort the loop keeps draining: queued summaries are cancelled, and
+            # runs already in flight are awaited and saved if they succeed.
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                # Handle everything that finished during the wait, in submission order.
+                finished = [future for future in futures if future in done]
+                for future in finished:
+                    task = futures[future]
+                    # Cancelled in the queue, or skipped by the worker after a network failure.
+                    if future.cancelled() or isinstance(future.exception(), CancelledError):
+                        continue
+                    status = "ok"
+                    try:
+                        codex_calls_total += 1
+                        data, usage = future.result()
+                        if usage is not None:
+                            codex_calls_with_usage += 1
+                            codex_usage_total["input_tokens"] += usage.get("input_tokens", 0)
+                            codex_usage_total["cached_input_tokens"] += usage.get("cached_input_tokens", 0)
+                            codex_usage_total["output_tokens"] += usage.get("output_tokens", 0)
+                    except Exception as exc:
+                        if task.rel_path not in parsed_sessions:
+                            raise  # reading the transcript failed, not Codex
+                        eprint(f"[warn] Failed to summarize {task.rel_path}: {exc}")
+                        had_failures = True
+                        msg = str(exc)
+                        if not printed_permission_hint and is_codex_sessions_permission_error(msg):
+                            printed_permission_hint = True
+                            eprint(
+                                "[hint] Codex could not write session files. Fix permissions on `~/.codex/sessions` "
+                                "or run with `--codex-home <writable-dir>`."
+                            )
+                        if not printed_network_hint and is_retryable_codex_error(msg):
+                            printed_network_hint = True
+                            eprint(
+                                "[hint] This looks like a network failure. If running inside the Codex "
+                                "`workspace-write` sandbox, enable outbound network access with "
+                                "`sandbox_workspace_write.network_access=true`. Otherwise verify connectivity and re-run. "
+                                "Consider lowering `--max-chars`."
+                            )
+                        if is_retryable_codex_error(msg):
+                            if not abort_due_to_network:
+                                abort_due_to_network = True
+                                eprint(
+                                    "[error] Aborting: Codex could not reach the network from this execution environment. "
+                                    "Enable sandbox network access (`sandbox_workspace_write.network_access=true`) and re-run."
+                                )
+                                # Stop queued summaries from starting; keep handling the rest so
+                                # summaries that finished alongside the failure are still saved.
+                                for queued in not_done:
+                                    queued.cancel()
+                            parsed_sessions.pop(task.rel_path, None)
+                            continue
+                        if not printed_auth_hint and is_codex_auth_error(msg):
+                            printed_auth_hint = True
+                            eprint(
+                                "[hint] Codex appears unauthenticated. Run `codex login status` and then `codex login`, "
+                                "or use `printenv OPENAI_API_KEY | codex login --with-api-key`."
+                            )
+                        status = "error"
+                        data = {
+                            "project_relevance": {
+                                "label": "unclear",
+                                "confidence": 0.0,
+                                "reason": "Summary generation failed.",
+                                "touched_areas": [],
+                            },
+                            "highlights": [FALLBACK_HIGHLIGHT],
+                            "decisions": [],
+                            "implementation_details": [],
+                            "open_questions": [],
+                            "security_notes": ["No sensitive data included in this entry."],
+                        }
+
+                    session = parsed_sessions.pop(task.rel_path)
+                    blocks[session.rel_path] = render_entry(
+                        session,
+                        session.sha256,
+                        data,
+                        status=status,
                         model=model,
                         reasoning_effort=reasoning_effort,
-                        history_persistence=args.codex_history_persistence,
-                        codex_cd=codex_cd,
-                        codex_config=codex_config,
-                        codex_env=codex_env,
-                        codex_fallback_env=codex_fallback_env,
-                        retries=codex_retries,
-                        retry_backoff_sec=codex_retry_backoff_sec,
-                        schema_path=summary_schema_path,
-                        prompt=prompt,
                     )
-                    if usage is not None:
-                        codex_calls_with_usage += 1
-                        codex_usage_total["input_tokens"] += usage.get("input_tokens", 0)
-                        codex_usage_total["cached_input_tokens"] += usage.get("cached_input_tokens", 0)
-                        codex_usage_total["output_tokens"] += usage.get("output_tokens", 0)
-                except Exception as exc:
-                    eprint(f"[warn] Failed to summarize {session.rel_path}: {exc}")
-                    had_failures = True
-                    msg = str(exc)
-                    if not printed_permission_hint and is_codex_sessions_permission_error(msg):
-                        printed_permission_hint = True
-                        eprint(
-                            "[hint] Codex could not write session files. Fix permissions on `~/.codex/sessions` "
-                            "or run with `--codex-home <writable-dir>`."
-                        )
-                    if not printed_network_hint and is_retryable_codex_error(msg):
-                        printed_network_hint = True
-                        eprint(
-                            "[hint] This looks like a network failure. If running inside the Codex "
-                            "`workspace-write` sandbox, enable outbound network access with "
-                            "`sandbox_workspace_write.network_access=true`. Otherwise verify connectivity and re-run. "
-                            "Consider lowering `--max-chars`."
-                        )
-                    if is_retryable_codex_error(msg):
-                        abort_due_to_network = True
-                        eprint(
-                            "[error] Aborting: Codex could not reach the network from this execution environment. "
-                            "Enable sandbox network access (`sandbox_workspace_write.network_access=true`) and re-run."
-                        )
-                        break
-                    if not printed_auth_hint and is_codex_auth_error(msg):
-                        printed_auth_hint = True
-                        eprint(
-                            "[hint] Codex appears unauthenticated. Run `codex login status` and then `codex login`, "
-                            "or use `printenv OPENAI_API_KEY | codex login --with-api-key`."
-                        )
-                    status = "error"
-                    data = {
-                        "project_relevance": {
-                            "label": "unclear",
-                            "confidence": 0.0,
-                            "reason": "Summary generation failed.",
-                            "touched_areas": [],
-                        },
-                        "highlights": [FALLBACK_HIGHLIGHT],
-                        "decisions": [],
-                        "implementation_details": [],
-                        "open_questions": [],
-                        "security_notes": ["No sensitive data included in this entry."],
-                    }
-
-                blocks[session.rel_path] = render_entry(
-                    session,
-                    sha,
-                    data,
-                    status=status,
-                    model=model,
-                    reasoning_effort=reasoning_effort,
-                )
-
-                # Incremental, resumable writes: safe to interrupt and re-run.
-                write_atomic(sessions_file, render_summary(before, after, history_order, blocks))
+                    unsaved += 1
+
+                # Incremental, resumable writes: safe to interrupt and re-run. Each rewrite renders
+                # every block, so batch them by count and age; `finally` flushes the remainder.
+                if unsaved >= SESSIONS_WRITE_EVERY or (
+                    unsaved and time.monotonic() - last_write >= SESSIONS_WRITE_INTERVAL_SEC
+                ):
+                    write_atomic(sessions_file, render_summary(before, after, history_order, blocks))
+                    unsaved = 0
+                    last_write = time.monotonic()
         except KeyboardInterrupt:
             eprint("Interrupted; partial progress is saved. Re-run to continue.")
             return 130
+        finally:
+            # Wait for in-flight `codex exec` runs while the temp dir (CODEX_HOME, cd, schema) still exists.
+            executor.shutdown(wait=True, cancel_futures=True)
+            if unsaved:
+                write_atomic(sessions_file, render_summary(before, after, history_order, blocks))
         if abort_due_to_network:
             return 3
 
-        sessions_body = "\n\n".join([blocks[rel_path] for rel_path in history_order if rel_path in blocks]).strip()
+        sessions_body = render_sessions_body(history_order, blocks)
         sessions_sha = sha256_text(sessions_body)
         if updates:
             eprint(f"Updated {sessions_file} ({len(updates)} updated, {kept} unchanged).")
@@ -1417,8 +1854,10 @@ def main(argv: list[str]) -> int:
             existing_journal_text = (
                 journal_file.read_text(encoding="utf-8", errors="replace") if journal_file.exists() else ""
             )
-            journal_sha = extract_journal_sessions_sha(existing_journal_text)
-            needs_journal = args.force_journal or (sessions_sha != (journal_sha or ""))
+            # Still read under --force-journal: render_journal_file keeps the manual notes from it.
+            needs_journal = args.force_journal or (
+                sessions_sha != (extract_journal_sessions_sha(existing_journal_text) or "")
+            )
             if needs_journal:
                 eprint("Generating condensed journal...")
                 if not args.no_prompt and sys.stdin.isatty():
@@ -1430,41 +1869,17 @@ def main(argv: list[str]) -> int:
                             "Reasoning effort (blank = use default; e.g. low|medium|high|xhigh): "
                         ).strip()
                         reasoning_effort = entered or None
-                prompt = "\n".join(
+                sessions_json = json.dumps(
                     [
-                        f"You are maintaining a concise engineering journal for the repository `{repo_root.name}`.",
-                        "",
-                        "Input: a list of per-session summaries from `.waylog/history/*.md`.",
-                        "Goal: output a usable, low-noise history of the project's evolution (decisions + implementation changes).",
-                        "",
-                        "Tooling constraint:",
-                        "- Do NOT run any shell commands or read any files. Use only the provided JSON input.",
-                        "",
-                        "Rules:",
-                        "- Preserve chronological order.",
-                        "- Focus only on items that affected the code/spec/docs/tests of this repository.",
-                        "- Drop sessions labeled `relevance_label=unrelated` unless they clearly impacted this repo anyway.",
-                        "- Remove noise: greetings, unrelated math, unrelated projects/topics, duplicated bullets, and repetitive security boilerplate.",
-                        "- Prefer milestones and deltas (what changed + why) over step-by-step narration.",
-                        "- Keep it compact (think: a changelog + decisions log).",
-                        "- Do NOT include secrets, credentials, tokens, API keys, passwords, private keys, or PII. If something was redacted, say 'redacted' without details.",
-                        "",
-                        "Produce markdown with dated sections (`## YYYY-MM-DD`) and bullets under each date.",
-                        "Optional: prefix bullets with area tags like `[spec]`, `[db]`, `[cli]`, `[web]`, `[docs]`, `[tests]`.",
-                        "",
-                        "Per-session summaries (JSON, sanitized):",
-                        json.dumps(
-                            [
-                                parsed
-                                for rel in history_order
-                                if rel in blocks
-                                and (parsed := parse_session_block_for_journal(blocks[rel])) is not None
-                            ],
-                            ensure_ascii=False,
-                        ),
-                        "",
-                    ]
+                        parsed
+                        for rel in history_order
+                        if (block := blocks.get(rel)) is not None
+                        and (parsed := parse_session_block_for_journal(block)) is not None
+                    ],
+                    ensure_ascii=False,
+                    separators=(",", ":"),
                 )
+                prompt = JOURNAL_PROMPT_TEMPLATE.format(repo_name=repo_root.name, sessions_json=sessions_json)
                 codex_calls_total += 1
                 try:
                     journal_body, usage = run_codex_journal(